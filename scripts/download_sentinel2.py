@@ -101,34 +101,33 @@ def calculate_ndvi(nir, red):
     Returns:
         numpy.ndarray: Rescaled NDVI array (8-bit).
     """
-    nir = nir.astype(float)
-    red = red.astype(float)
-
-    # Avoid division by zero
-    np.seterr(divide="ignore", invalid="ignore")
-
-    numerator = nir - red
-    denominator = nir + red
+    # Stay in float64: rounding the rescaled ratio in float32 shifts some pixels by one
+    nir = nir.astype(np.float64)
+    red = red.astype(np.float64)
 
     # NDVI calculation with custom handling:
     # - If numerator is zero, set NDVI to zero.
     # - If any input is NaN, NDVI remains NaN.
-    ndvi = np.where(
-        numerator == 0, 0,  # If numerator is zero, NDVI is zero
-        numerator / denominator  # Otherwise, compute NDVI as usual
-    )
+    # All steps run in place on two buffers instead of allocating a temporary per operation.
+    ndvi = np.subtract(nir, red)
+    denominator = np.add(nir, red, out=nir)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(ndvi, denominator, out=ndvi, where=ndvi != 0)
 
     # Rescale from [-1, 1] to [1, 255] (keep 0 for invalid pixels)
-    ndvi_rescaled = np.round(1+(ndvi + 1.0) * 127)
-    ndvi_rescaled[np.isnan(ndvi)] = 0
-    ndvi_rescaled = ndvi_rescaled.astype(np.uint8)
+    invalid = np.isnan(ndvi)
+    ndvi += 1.0
+    ndvi *= 127
+    ndvi += 1
+    np.round(ndvi, out=ndvi)
+    ndvi[invalid] = 0
 
-    return ndvi_rescaled
+    return ndvi.astype(np.uint8)
 
 
 def process_zip_to_ndvi(zip_path, output_dir):
     """
-    Extract a ZIP archive and calculate NDVI from its bands, then save a GeoTIFF.
+    Read the bands of a ZIP archive in place and calculate NDVI, then save a GeoTIFF.
     Args:
         zip_path (str): Path to the ZIP archive.
         output_dir (str): Directory to save the processed GeoTIFF.
@@ -139,31 +138,24 @@ def process_zip_to_ndvi(zip_path, output_dir):
     output_file = os.path.join(output_dir, f"{tile_id}.tif")
     logger.debug(f"Processing {zip_path} into {output_file}")
 
-    # Extract the ZIP file
+    # List the archive instead of extracting it; only two of its bands are needed
     with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        zip_ref.extractall(output_dir)
+        members = zip_ref.namelist()
 
     # Locate the `.SAFE` directory (Sentinel-2 data format)
-    safe_dir = next((os.path.join(output_dir, d) for d in os.listdir(output_dir) if d.endswith(".SAFE")), None)
-    if not safe_dir:
-        raise FileNotFoundError("Could not find the .SAFE directory in the extracted archive.")
-
-    # Locate the GRANULE subdirectory
-    granule_dir = next((os.path.join(safe_dir, "GRANULE", d) for d in os.listdir(os.path.join(safe_dir, "GRANULE"))), None)
-    if not granule_dir:
-        raise FileNotFoundError("Could not find the GRANULE directory in the .SAFE structure.")
-
-    # Locate the 10m resolution folder
-    r10m_dir = os.path.join(granule_dir, "IMG_DATA", "R10m")
-    if not os.path.isdir(r10m_dir):
-        raise FileNotFoundError("Could not find the R10m folder in the GRANULE directory.")
+    if not any(".SAFE/" in m for m in members):
+        raise FileNotFoundError("Could not find the .SAFE directory in the archive.")
 
+    # Locate the bands in the 10m resolution folder (.SAFE/GRANULE/<granule>/IMG_DATA/R10m)
     nir_band = red_band = None
-    for file in os.listdir(r10m_dir):
-        if file.endswith("_B08_10m.jp2"):  # NIR band
-            nir_band = os.path.join(r10m_dir, file)
-        elif file.endswith("_B04_10m.jp2"):  # Red band
-            red_band = os.path.join(r10m_dir, file)
+    for member in members:
+        if "/GRANULE/" not in member or "/IMG_DATA/R10m/" not in member:
+            continue
+        # GDAL reads the JPEG2000 bands straight out of the archive
+        if member.endswith("_B08_10m.jp2"):  # NIR band
+            nir_band = f"zip://{os.path.abspath(zip_path)}!{member}"
+        elif member.endswith("_B04_10m.jp2"):  # Red band
+            red_band = f"zip://{os.path.abspath(zip_path)}!{member}"
 
     if not nir_band or not red_band:
         raise FileNotFoundError("Could not find NIR or Red bands in the R10m folder.")
@@ -173,7 +165,12 @@ def process_zip_to_ndvi(zip_path, output_dir):
         nir = src_nir.read(1, resampling=Resampling.bilinear)
         red = src_red.read(1, resampling=Resampling.bilinear)
         meta = src_nir.meta.copy()
-        meta.update({"driver": "GTiff", "dtype": "uint8", "compress": "JPEG", "nodata": 0})
+        # Tiled + DEFLATE with horizontal differencing: lossless, compact for smooth NDVI,
+        # and lets the NDVI endpoints read windows without decoding whole strips
+        meta.update({"driver": "GTiff", "dtype": "uint8", "nodata": 0,
+                     "compress": "DEFLATE", "predictor": 2,
+                     "tiled": True, "blockxsize": 512, "blockysize": 512,
+                     "num_threads": "ALL_CPUS"})
 
     # Calculate NDVI
     ndvi = calculate_ndvi(nir, red)
@@ -216,12 +213,8 @@ def download_and_process(feature, credentials, output_dir):
         zip_path = os.path.join(date_dir, zip_path)
         ndvi_path = process_zip_to_ndvi(zip_path, date_dir)
 
-        # Cleanup intermediate files
+        # Cleanup intermediate files; bands are read in place, so only the ZIP remains
         os.remove(zip_path)  # Delete ZIP file
-        safe_dir = next((os.path.join(date_dir, d) for d in os.listdir(date_dir) if d.endswith(".SAFE")), None)
-        if safe_dir and os.path.isdir(safe_dir):
-            import shutil
-            shutil.rmtree(safe_dir)  # Delete extracted SAFE directory
 
         return "success"  # Indicating success
     except Exception as e:
@@ -11,6 +11,8 @@ import numpy as np
 import requests
 import zipfile
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify, send_file, redirect, url_for
 from shapely.geometry import shape, mapping
@@ -39,6 +41,57 @@ NLCD_FILE      = os.path.join(os.path.dirname(__file__),
     'Annual_NLCD_LndCov_2024_CU_C1V1',
     'Annual_NLCD_LndCov_2024_CU_C1V1.tif'
 )
+# GDAL warp tuning: leave one core free for the Flask worker
+WARP_THREADS   = max(1, (os.cpu_count() or 1) - 1)
+WARP_MEM_LIMIT = 512  # MB
+# Thread budget: the four ETmap sources run side by side, so each gets a share of
+# WARP_THREADS, but never fewer than a few workers (capped at WARP_THREADS) so
+# small hosts still overlap reads and writes. Pooled stages keep their GDAL calls
+# single-threaded; a source that makes one large GDAL call uses its whole share
+ETMAP_SOURCES      = 4
+MIN_SOURCE_THREADS = 4
+SOURCE_THREADS     = min(WARP_THREADS, max(MIN_SOURCE_THREADS, WARP_THREADS // ETMAP_SOURCES))
+# GDAL read tuning: multithreaded decompression, within the source's share, for
+# the single national NLCD read. Entered in the job's own thread because rasterio
+# environments are thread-local (the block cache size is process-global, so it
+# is left to GDAL's own GDAL_CACHEMAX setting)
+READ_ENV = {'GDAL_NUM_THREADS': SOURCE_THREADS}
+
+def _gtiff_compression():
+    """Fast ZSTD when this GDAL build has it, otherwise DEFLATE."""
+    # GDAL only warns about an unknown COMPRESS value, so write a 1x1 probe and
+    # check which codec actually ended up in the file
+    try:
+        with rasterio.MemoryFile() as memfile:
+            with memfile.open(driver='GTiff', width=1, height=1, count=1,
+                              dtype='uint8', compress='zstd') as dst:
+                dst.write(np.zeros((1, 1, 1), dtype='uint8'))
+            with memfile.open() as src:
+                if src.profile.get('compress') == 'zstd':
+                    return {'compress': 'zstd', 'zstd_level': 1}
+    except Exception:
+        pass
+    return {'compress': 'deflate'}
+
+# GeoTIFF creation options shared by every output: tiled for partial reads
+# instead of the inherited strip layout, compressed on GDAL's process-wide worker
+# pool, which concurrent writers share, so WARP_THREADS bounds it. The codec, ZSTD or deflate, is
+# added by gtiff_profile() on first use. Writers pick the predictor
+# (2 = horizontal differencing for integer bands, 3 = floating point)
+GTIFF_PROFILE = {
+    'driver': 'GTiff',
+    'tiled': True,
+    'blockxsize': 256,
+    'blockysize': 256,
+    'num_threads': WARP_THREADS,
+    'BIGTIFF': 'IF_SAFER',
+}
+
+@lru_cache(maxsize=None)
+def gtiff_profile():
+    """GeoTIFF creation options, resolved on first use so importing the module stays cheap."""
+    return {**GTIFF_PROFILE, **_gtiff_compression()}
+
 # Ensure dirs exist
 os.makedirs(ETMAP_DATA_DIR, exist_ok=True)
 os.makedirs(RESULTS_DIR, exist_ok=True)
@@ -46,6 +99,9 @@ os.makedirs(RESULTS_DIR, exist_ok=True)
 # Initialize SQLite connection
 conn   = sqlite3.connect(db_path, check_same_thread=False)
 cursor = conn.cursor()
+# The shared cursor is used from request threads and from the per-source job
+# threads, so every execute/fetch/commit sequence goes through this lock
+db_lock = threading.Lock()
 
 # Create table if not exists
 cursor.execute('''
@@ -69,8 +125,9 @@ grid_meta = load_grid()
 
 # Helper to update job status
 def update_status(job_id, status):
-    cursor.execute('UPDATE etmap_jobs SET status=? WHERE uniqueid=?', (status, job_id))
-    conn.commit()
+    with db_lock:
+        cursor.execute('UPDATE etmap_jobs SET status=? WHERE uniqueid=?', (status, job_id))
+        conn.commit()
 
 # ------------------- Landsat -------------------
 def run_landsat_job(job_id, date_from, date_to, geom_json):
@@ -95,14 +152,15 @@ def run_landsat_job(job_id, date_from, date_to, geom_json):
     dst_width, dst_height = gm['size_px']
     dst_crs = gm['crs']
 
-    for item in items:
+    def process_item(item):
         date_str = item.datetime.date().isoformat()
         href = planetary_computer.sign_url(item.assets['red'].href)
         try:
+            # Dates already fan out over SOURCE_THREADS, so GDAL stays single-threaded here
             with rasterio.open(href) as src:
                 poly = transform_geom('EPSG:4326', src.crs, mapping(aoi))
-                clipped, t_clip = mask(src, [poly], crop=True)
-                arr = clipped[0]
+                # Only decode the band we reproject
+                arr, t_clip = mask(src, [poly], crop=True, indexes=1)
                 out_arr = np.empty((dst_height, dst_width), dtype=arr.dtype)
                 reproject(
                     source=arr,
@@ -111,10 +169,14 @@ def run_landsat_job(job_id, date_from, date_to, geom_json):
                     src_crs=src.crs,
                     dst_transform=dst_affine,
                     dst_crs=dst_crs,
-                    resampling=Resampling.bilinear
+                    resampling=Resampling.bilinear,
+                    num_threads=1,
+                    warp_mem_limit=WARP_MEM_LIMIT
                 )
                 profile = src.profile.copy()
                 profile.update({
+                    **gtiff_profile(),
+                    'predictor': 2,
                     'crs': dst_crs,
                     'transform': dst_affine,
                     'width': dst_width,
@@ -126,12 +188,30 @@ def run_landsat_job(job_id, date_from, date_to, geom_json):
                     dst.write(out_arr, 1)
         except Exception as e:
             print(f"Error fetching Landsat {date_str}: {e}", file=sys.stderr)
+
+    # Scenes from the same day write the same output file, so keep them in
+    # catalog order on one worker and fan out across days
+    items_by_date = {}
+    for item in items:
+        items_by_date.setdefault(item.datetime.date(), []).append(item)
+
+    def process_date(date_items):
+        for item in date_items:
+            process_item(item)
+
+    if items_by_date:
+        with ThreadPoolExecutor(max_workers=min(SOURCE_THREADS, len(items_by_date))) as executor:
+            list(executor.map(process_date, items_by_date.values()))
     update_status(job_id, 'landsat: done')
 
 # ------------------- PRISM -------------------
 PRISM_VARS = ["ppt","tmin","tmax","tmean","tdmean","vpdmin","vpdmax"]
 REGION = "us"
 RESOLUTION = "4km"
+# Streamed download chunk size for the PRISM zip archives
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+# Concurrent days; kept low to stay polite to the PRISM web service
+PRISM_WORKERS = 4
 
 def run_prism_job(job_id, date_from, date_to, geom_json):
     update_status(job_id, 'prism: started')
@@ -139,9 +219,7 @@ def run_prism_job(job_id, date_from, date_to, geom_json):
     os.makedirs(outdir, exist_ok=True)
     aoi = shape(json.loads(geom_json))
 
-    cur = datetime.fromisoformat(date_from)
-    end = datetime.fromisoformat(date_to)
-    while cur <= end:
+    def process_day(cur):
         ymd = cur.strftime('%Y%m%d')
         mm = cur.strftime('%m-%d')
         day_dir = os.path.join(outdir, mm)
@@ -152,13 +230,14 @@ def run_prism_job(job_id, date_from, date_to, geom_json):
             try:
                 r = requests.get(url, stream=True)
                 r.raise_for_status()
-                content = r.content
                 ct = r.headers.get('Content-Type','')
                 with tempfile.TemporaryDirectory() as td:
                     p = os.path.join(td, f"{var}_{ymd}")
+                    # Stream straight to disk rather than buffering the whole archive in memory
                     with open(p, 'wb') as f:
-                        f.write(content)
-                    if 'zip' in ct or content.startswith(b'PK'):
+                        for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                    if 'zip' in ct or zipfile.is_zipfile(p):
                         with zipfile.ZipFile(p) as z:
                             z.extractall(td)
                         tifs = [f for f in os.listdir(td) if f.lower().endswith('.tif')]
@@ -176,8 +255,26 @@ def run_prism_job(job_id, date_from, date_to, geom_json):
             stack = xr.concat(rasters, dim=idx)
             stack.rio.write_crs('EPSG:4326', inplace=True)
             clipped = stack.rio.clip([mapping(aoi)], crs='EPSG:4326', drop=True)
-            clipped.rio.to_raster(os.path.join(day_dir, f"prism_{mm}.tif"))
+            # Band-interleaved so each variable is compressed and read back on its own
+            clipped.rio.to_raster(os.path.join(day_dir, f"prism_{mm}.tif"),
+                                  predictor=3, interleave='band', **gtiff_profile())
+
+    # Output folders are keyed by month-day, so ranges longer than a year reuse a
+    # folder; keep those days in order on one worker and fan out across folders
+    days_by_folder = {}
+    cur = datetime.fromisoformat(date_from)
+    end = datetime.fromisoformat(date_to)
+    while cur <= end:
+        days_by_folder.setdefault(cur.strftime('%m-%d'), []).append(cur)
         cur += timedelta(days=1)
+
+    def process_folder(days):
+        for day in days:
+            process_day(day)
+
+    if days_by_folder:
+        with ThreadPoolExecutor(max_workers=min(PRISM_WORKERS, len(days_by_folder))) as executor:
+            list(executor.map(process_folder, days_by_folder.values()))
     update_status(job_id, 'prism: done')
 
 # ------------------- NLDAS -------------------
@@ -187,13 +284,27 @@ def run_nldas_job(job_id, date_from, date_to, geom_json):
     os.makedirs(outdir, exist_ok=True)
     aoi = shape(json.loads(geom_json))
     ds = nldas.get_bygeom(aoi, date_from, date_to).rio.write_crs('EPSG:4326', inplace=False)
+    # Clip all variables and hours in one pass; the AOI mask is the same for every slice
+    ds = ds.rio.clip([mapping(aoi)], crs='EPSG:4326', drop=True)
+    ds = ds.load()
+
+    def write_hour(var, t):
+        da = ds[var].sel(time=t)
+        ts = np.datetime_as_string(t, unit='h').replace('T','')
+        da.rio.to_raster(os.path.join(outdir, var, f"{var}_{ts}.tif"),
+                        predictor=3, **gtiff_profile())
+
     for var in ds.data_vars:
-        var_dir = os.path.join(outdir, var)
-        os.makedirs(var_dir, exist_ok=True)
-        for t in ds.time.values:
-            da = ds[var].sel(time=t).rio.clip([mapping(aoi)], crs='EPSG:4326', drop=True)
-            ts = np.datetime_as_string(t, unit='h').replace('T','')
-            da.rio.to_raster(os.path.join(var_dir, f"{var}_{ts}.tif"))
+        os.makedirs(os.path.join(outdir, var), exist_ok=True)
+    # Each (variable, hour) slice is an independent file; GDAL releases the GIL while writing
+    with ThreadPoolExecutor(max_workers=SOURCE_THREADS) as executor:
+        futures = [
+            executor.submit(write_hour, var, t)
+            for var in ds.data_vars
+            for t in ds.time.values
+        ]
+        for future in as_completed(futures):
+            future.result()
     update_status(job_id, 'nldas: done')
 
 # ------------------- NLCD -------------------
@@ -203,10 +314,9 @@ def run_nlcd_job(job_id, date_from, date_to, geom_json):
     os.makedirs(outdir, exist_ok=True)
     aoi = shape(json.loads(geom_json))
     try:
-        with rasterio.open(NLCD_FILE) as src:
+        with rasterio.Env(**READ_ENV), rasterio.open(NLCD_FILE) as src:
             poly = transform_geom('EPSG:4326', src.crs, mapping(aoi))
-            clipped, t_clip = mask(src, [poly], crop=True)
-            arr = clipped[0]
+            arr, t_clip = mask(src, [poly], crop=True, indexes=1)
             gm = grid_meta
             dst_affine = Affine(*gm['transform'])
             w, h = gm['size_px']
@@ -218,10 +328,14 @@ def run_nlcd_job(job_id, date_from, date_to, geom_json):
                 src_crs=src.crs,
                 dst_transform=dst_affine,
                 dst_crs=gm['crs'],
-                resampling=Resampling.nearest
+                resampling=Resampling.nearest,
+                num_threads=SOURCE_THREADS,
+                warp_mem_limit=WARP_MEM_LIMIT
             )
             profile = src.profile.copy()
             profile.update({
+                **gtiff_profile(),
+                'predictor': 2,
                 'crs': gm['crs'],
                 'transform': dst_affine,
                 'width': w,
@@ -237,17 +351,24 @@ def run_nlcd_job(job_id, date_from, date_to, geom_json):
 
 # ------------------- Combined runner -------------------
 def run_all_jobs(job_id, date_from, date_to, geom_json):
-    for name, fn in [
-        ('landsat', run_landsat_job),
-        ('prism', run_prism_job),
-        ('nldas', run_nldas_job),
-        ('nlcd',  run_nlcd_job)
-    ]:
+    def run_source(name, fn):
         try:
             fn(job_id, date_from, date_to, geom_json)
         except Exception as e:
             print(f"{name} job failed: {e}", file=sys.stderr)
             update_status(job_id, f"{name}: failed")
+
+    # The four sources hit different services and write to separate folders,
+    # so run them side by side and wait for all of them before finishing
+    sources = [
+        ('landsat', run_landsat_job),
+        ('prism', run_prism_job),
+        ('nldas', run_nldas_job),
+        ('nlcd',  run_nlcd_job)
+    ]
+    with ThreadPoolExecutor(max_workers=ETMAP_SOURCES) as executor:
+        for future in [executor.submit(run_source, name, fn) for name, fn in sources]:
+            future.result()
     update_status(job_id, 'success')
     # After successful completion, copy placeholder to results folder
     placeholder_src = os.path.join(os.path.dirname(__file__), 'placeholder.png')
@@ -271,11 +392,13 @@ def etmap_start():
 
     date_from = data['date_from']
     date_to   = data['date_to']
-    cursor.execute(
-        'SELECT uniqueid, request_json FROM etmap_jobs WHERE date_from=? AND date_to=?',
-        (date_from, date_to)
-    )
-    for existing_uid, req_json in cursor.fetchall():
+    with db_lock:
+        cursor.execute(
+            'SELECT uniqueid, request_json FROM etmap_jobs WHERE date_from=? AND date_to=?',
+            (date_from, date_to)
+        )
+        existing = cursor.fetchall()
+    for existing_uid, req_json in existing:
         prev = json.loads(req_json)
         if prev.get('geometry') == data['geometry']:
             return jsonify({'uniqueid': existing_uid}), 200
@@ -284,11 +407,12 @@ def etmap_start():
     now      = datetime.utcnow().isoformat()
     geom_json= json.dumps(data['geometry'], sort_keys=True)
     req_json = json.dumps(data, sort_keys=True)
-    cursor.execute(
-        'INSERT INTO etmap_jobs(uniqueid,date_from,date_to,geometry,status,request_json,created_at) VALUES (?,?,?,?,?,?,?)',
-        (job_id, date_from, date_to, geom_json, 'queued', req_json, now)
-    )
-    conn.commit()
+    with db_lock:
+        cursor.execute(
+            'INSERT INTO etmap_jobs(uniqueid,date_from,date_to,geometry,status,request_json,created_at) VALUES (?,?,?,?,?,?,?)',
+            (job_id, date_from, date_to, geom_json, 'queued', req_json, now)
+        )
+        conn.commit()
     threading.Thread(
         target=run_all_jobs,
         args=(job_id, date_from, date_to, geom_json),
@@ -303,8 +427,9 @@ def etmap_status(job_id):
         uuid.UUID(job_id)
     except ValueError:
         return jsonify({'error':'Invalid UUID'}), 400
-    cursor.execute('SELECT status, created_at, request_json FROM etmap_jobs WHERE uniqueid=?', (job_id,))
-    row = cursor.fetchone()
+    with db_lock:
+        cursor.execute('SELECT status, created_at, request_json FROM etmap_jobs WHERE uniqueid=?', (job_id,))
+        row = cursor.fetchone()
     if not row:
         return jsonify({'error':'Unknown job ID'}), 404
     status, created_at, req_json = row
@@ -317,8 +442,9 @@ def etmap_result_png(job_id):
         uuid.UUID(job_id)
     except ValueError:
         return jsonify({'error':'Invalid UUID'}), 400
-    cursor.execute('SELECT status FROM etmap_jobs WHERE uniqueid=?', (job_id,))
-    row = cursor.fetchone()
+    with db_lock:
+        cursor.execute('SELECT status FROM etmap_jobs WHERE uniqueid=?', (job_id,))
+        row = cursor.fetchone()
     if not row:
         return jsonify({'error':'Unknown job ID'}), 404
     status = row[0]
@@ -6,6 +6,7 @@ from sklearn.preprocessing import StandardScaler, RobustScaler, MinMaxScaler, Po
 from sklearn.decomposition import PCA
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.covariance import EllipticEnvelope
+from sklearn.metrics import pairwise_distances
 
 from scipy.stats import trim_mean, trimboth, chi2
 from scipy.spatial import KDTree
@@ -19,6 +20,7 @@ import pysal.lib
 from esda.moran import Moran, Moran_BV_matrix
 from libpysal.weights import DistanceBand, KNN
 
+import logging
 import random
 from tqdm.auto import tqdm
 from itertools import combinations
@@ -26,6 +28,17 @@ from functools import lru_cache
 import itertools
 from extract_points import *
 
+logger = logging.getLogger(__name__)
+
+MAX_SCORED_COMBINATIONS = 10000  # Limit to prevent excessive computation
+
+# Scaler classes by scheme name; only the chosen one is instantiated per call
+SCALERS = {
+    'RobustScaler'     : RobustScaler,
+    'StandardScaler'   : StandardScaler,
+    'PowerTransformer' : PowerTransformer
+}
+
 def IQR_outliers(PCs, _threshold):
     """
     Filters out rows from the input array `PCs` that contain outliers.
@@ -109,7 +122,6 @@ def elliptic_envelope_outliers(PCs, contamination_rate):
 
 def generate_design(data, n_samples, whitten=0):
     ccd = ccdesign(2, center=(1,1), alpha='o', face='cci')
-    scaled_ccd = np.zeros_like(ccd) # Initialize scaled CCD with the correct shape
     ccd_min, ccd_max = ccd.min(axis=0), ccd.max(axis=0) # Compute scaling parameters
     data_min, data_max = np.percentile(data, [whitten, 100-whitten], axis=0)
     scaled_ccd = (ccd - ccd_min) / (ccd_max - ccd_min) * (data_max - data_min) + data_min # Scale design
@@ -136,9 +148,9 @@ def iter_combinations(num_combs=np.nan, filtered_distances = None, filtered_indi
     idxs = filtered_indices
 
     total_combs = np.prod([len(row) if len(row) else 1 for row in dists])
-    print(f"Total possible combinations are {total_combs}")
+    logger.debug("Total possible combinations are %s", total_combs)
     num_combs = int(np.nanmin([num_combs, total_combs]))
-    print(f"iterating through {num_combs} of them")
+    logger.debug("iterating through %d of them", num_combs)
 
 
     # Generate unique combinations efficiently
@@ -189,18 +201,9 @@ def select_points(df, num_samples=10, epsg_code = 32618, scalar_scheme = 'Standa
     gdf = gpd.GeoDataFrame(selected_df, geometry=geometry)
     gdf.crs = f"EPSG:{epsg_code}"
 
-    scaler = {
-    'RobustScaler'     : RobustScaler(),
-    'StandardScaler'   : StandardScaler(),
-    'PowerTransformer' : PowerTransformer()
-    }[scalar_scheme]
+    scaler = SCALERS[scalar_scheme]()
     
     X_scaled = scaler.fit_transform(selected_df.values)
-    pca = PCA(n_components=X_scaled.shape[1])
-    X_pca = pca.fit_transform(X_scaled)
-    
-    cumulative_variance = np.cumsum(pca.explained_variance_ratio_)
-    cdf = pd.DataFrame(np.multiply(cumulative_variance, 100).round(3).reshape(1,-1).tolist(), columns=list(range(1,len(cumulative_variance)+1)), index=["% cumulative variance captured :"])
 
     pca_selection = 2
     
@@ -211,7 +214,6 @@ def select_points(df, num_samples=10, epsg_code = 32618, scalar_scheme = 'Standa
     PCs = pca.fit_transform(X_scaled)
     
     rows_to_keep = np.ones(PCs.shape[0], dtype=bool)
-    filtered_Pcs = PCs[:,:]
     preferedPCs = None
     filtered_distances = None
     filtered_indices = None
@@ -221,7 +223,6 @@ def select_points(df, num_samples=10, epsg_code = 32618, scalar_scheme = 'Standa
     NNearest_neighbour = 3 # change this
 
     allowed_samples = [5, 10, 12, 15, 20]# change this
-    design = generate_design(filtered_Pcs, num_samples, whitten)
 
     if outlier_technique == 'IQR Thresholding':
         rows_to_keep = IQR_outliers(PCs, threshold)
@@ -241,24 +242,19 @@ def select_points(df, num_samples=10, epsg_code = 32618, scalar_scheme = 'Standa
     # BUG FIX: Ensure design has exactly num_samples points
     if len(design) > num_samples:
         # Select the most central points if we have too many
-        from sklearn.metrics import pairwise_distances
         dist_matrix = pairwise_distances(design)
         centrality = np.sum(dist_matrix, axis=1)
         most_central_indices = np.argsort(centrality)[:num_samples]
         design = design[most_central_indices]
     elif len(design) < num_samples:
         # Adjust num_samples if we don't have enough design points
-        print(f"\x1b[33mWarning: Adjusting num_samples from {num_samples} to {len(design)} due to design constraints\x1b[0m")
+        logger.warning("Adjusting num_samples from %d to %d due to design constraints", num_samples, len(design))
         num_samples = len(design)
 
     Geo_space_X = df.loc[rows_to_keep, lat]
     Geo_space_Y = df.loc[rows_to_keep, lon]
     Geo_space_XY = np.array([Geo_space_X, Geo_space_Y]).T
     Var_space_XY = filtered_Pcs
-    max_dist = np.max(distance_matrix(Geo_space_XY,
-                           Geo_space_XY))
-    geo_max = max_dist
-    geo_min = 0 + epsilion
     var_max = .25 # change this
     var_min = 0 + epsilion
     
@@ -281,14 +277,14 @@ def select_points(df, num_samples=10, epsg_code = 32618, scalar_scheme = 'Standa
     ind_ko = np.unique(indices[valid_indices])
     avg = np.average(distances, axis=1)
     
-    print(filtered_indices)
+    logger.debug("Filtered indices: %s", filtered_indices)
     
     if (np.min(distances, axis=1) > var_max).any():
-        print("\x1b[31mError: scaled design does not fit in varibale scale, please refer to graph to fit the design properly \x1b[0m")
+        logger.error("scaled design does not fit in varibale scale, please refer to graph to fit the design properly")
     elif (avg > var_max).any():
-        print('''\x1b[33mWarning: scaled design is not a good fit in varibale scale,
-                 kindly readjust the thresholds and try again for better fit
-                 or try using a different scaler to change the distribution \x1b[0m''')
+        logger.warning("scaled design is not a good fit in varibale scale, "
+                       "kindly readjust the thresholds and try again for better fit "
+                       "or try using a different scaler to change the distribution")
     # finding unique ind across all design points
     assigned_to = {}  # Tracks which design point an index is assigned to
     point_counts = np.zeros(len(design), dtype=int)  # Tracks how many points are assigned to each design point
@@ -363,18 +359,18 @@ def select_points(df, num_samples=10, epsg_code = 32618, scalar_scheme = 'Standa
         else:
             candidate_sets.append(filtered_indices[i])
     
-    # Generate combinations ensuring one candidate per design point
-    all_combinations = list(itertools.product(*candidate_sets))
+    # Generate combinations ensuring one candidate per design point, streaming
+    # the product lazily and stopping once enough distinct ones are found
+    all_combinations = itertools.product(*candidate_sets)
     
     # Filter for distinct points only (no duplicates)
-    distinct_combinations = []
-    for combo in all_combinations:
-        if len(set(combo)) == num_samples:  # Ensure all points are unique
-            distinct_combinations.append(combo)
+    distinct_combinations = list(itertools.islice(
+        (combo for combo in all_combinations if len(set(combo)) == num_samples),  # Ensure all points are unique
+        MAX_SCORED_COMBINATIONS))
     
     # If no valid combinations found, use fallback
     if not distinct_combinations:
-        print("\x1b[33mWarning: No distinct combinations found, using best available candidates\x1b[0m")
+        logger.warning("No distinct combinations found, using best available candidates")
         final_result = []
         used_indices = set()
         for candidates in candidate_sets:
@@ -389,7 +385,7 @@ def select_points(df, num_samples=10, epsg_code = 32618, scalar_scheme = 'Standa
         final_score = float('-inf')
         final_result = None
         
-        for combo in tqdm(distinct_combinations[:10000], desc="Scoring combinations"):  # Limit to prevent excessive computation
+        for combo in tqdm(distinct_combinations, desc="Scoring combinations"):
             idx = np.array(combo)
             
             # Calculate geographic spread
@@ -397,12 +393,9 @@ def select_points(df, num_samples=10, epsg_code = 32618, scalar_scheme = 'Standa
             np.fill_diagonal(dist_matrix, np.inf)
             dgmin = np.nanmin(dist_matrix)
             
-            # Calculate feature representation
-            max_feature_dist = 0
-            for i, point_idx in enumerate(idx):
-                dist_to_design = np.linalg.norm(Var_space_XY[point_idx] - design[i])
-                if dist_to_design > max_feature_dist:
-                    max_feature_dist = dist_to_design
+            # Calculate feature representation: the largest distance between a
+            # chosen point and its design point, for all pairs at once
+            max_feature_dist = np.linalg.norm(Var_space_XY[idx] - design, axis=1).max(initial=0)
             
             dgmin = scale_geo(dgmin)
             dvmax = scale_var(max_feature_dist)
@@ -417,7 +410,7 @@ def select_points(df, num_samples=10, epsg_code = 32618, scalar_scheme = 'Standa
     if len(final_result) > num_samples:
         final_result = final_result[:num_samples]
     elif len(final_result) < num_samples:
-        print(f"\x1b[33mWarning: Only {len(final_result)} points selected instead of {num_samples}\x1b[0m")
+        logger.warning("Only %d points selected instead of %d", len(final_result), num_samples)
     
     #Morgans:
     if Morgans:
@@ -430,17 +423,13 @@ def select_points(df, num_samples=10, epsg_code = 32618, scalar_scheme = 'Standa
         final_result = None
         features = Var_space_XY.shape[1]
 
-        for combo in tqdm(distinct_combinations[:10000], desc="Scoring with Moran's I"):
+        for combo in tqdm(distinct_combinations, desc="Scoring with Moran's I"):
             idx = np.array(combo)
             dist_matrix = distance_matrix(Geo_space_XY[idx], Geo_space_XY[idx])
             np.fill_diagonal(dist_matrix, np.inf)
             dgmin = np.nanmin(dist_matrix)
             
-            max_feature_dist = 0
-            for i, point_idx in enumerate(idx):
-                dist_to_design = np.linalg.norm(Var_space_XY[point_idx] - design[i])
-                if dist_to_design > max_feature_dist:
-                    max_feature_dist = dist_to_design
+            max_feature_dist = np.linalg.norm(Var_space_XY[idx] - design, axis=1).max(initial=0)
 
             dgmin = scale_geo(dgmin)
             dvmax = scale_var(max_feature_dist)
@@ -448,16 +437,17 @@ def select_points(df, num_samples=10, epsg_code = 32618, scalar_scheme = 'Standa
             # Calculate Moran's I for spatial spread
             weights = DistanceBand.from_array(Geo_space_XY[idx], threshold=20, binary=True, silence_warnings=True)
 
-            # Ensure weights are valid
-            if np.any(np.isnan(weights.sparse.toarray())) or np.any(np.isinf(weights.sparse.toarray())):
+            # Ensure weights are valid; implicit zeros are finite, so checking the
+            # stored entries is enough and avoids densifying the matrix
+            if not np.isfinite(weights.sparse.data).all():
                 continue  # Skip this iteration if weights are invalid
 
             mi_values = []
             for j in range(features):
                 values = Var_space_XY[idx, j]
-                if not np.any(np.isnan(values)) and not np.any(np.isinf(values)):
+                if np.isfinite(values).all():
                     mi = Moran(values, weights)
-                    if not np.isnan(mi.I) and not np.isinf(mi.I):
+                    if np.isfinite(mi.I):
                         mi_values.append(mi.I)
 
             if mi_values:
@@ -14,6 +14,11 @@ import rasterio.mask
 import pynldas2 as nldas
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# Default PRISM daily variables, in output order
+PRISM_VARIABLES = ("ppt","tmin","tmax","tmean","tdmean","vpdmin","vpdmax")
+# Streamed download chunk size for the PRISM zip archives
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
 def write_points(path, records, x_field="x", y_field="y", crs="EPSG:4326"):
     gdf = gpd.GeoDataFrame(
         records,
@@ -25,15 +30,14 @@ def write_points(path, records, x_field="x", y_field="y", crs="EPSG:4326"):
 def fetch_3dep_elevation(polygon_geojson: dict, resolution: int = 30) -> dict:
     geom = shape(polygon_geojson)
     dem = py3dep.get_dem(geom, resolution)
-    results = []
-    idx = 0
-    for yi, y in enumerate(dem.y.values):
-        for xi, x in enumerate(dem.x.values):
-            val = dem.isel(x=xi, y=yi).item()
-            if np.isnan(val):
-                continue
-            results.append({"id": idx, "x": float(x), "y": float(y), "elevation": float(val)})
-            idx += 1
+    # Mask NaNs over the whole grid at once instead of indexing the DataArray per pixel
+    xs, ys = np.meshgrid(dem.x.values, dem.y.values)
+    vals = dem.transpose("y", "x").values
+    valid = ~np.isnan(vals)
+    results = [
+        {"id": idx, "x": x, "y": y, "elevation": val}
+        for idx, (x, y, val) in enumerate(zip(xs[valid].tolist(), ys[valid].tolist(), vals[valid].tolist()))
+    ]
     return {"query": {"resolution_m": resolution}, "results": results}
 
 def fetch_ssurgo_components(polygon_geojson: dict) -> dict:
@@ -68,12 +72,27 @@ def fetch_nldas_timeseries(polygon_geojson: dict, date_from: str, date_to: str)
         results.append({"id": idx, "x": float(lon), "y": float(lat), "series": series})
     return {"query": {"from": date_from, "to": date_to}, "results": results}
 
+def _fetch_prism_clip(poly, var: str, date_str: str, region: str, resolution: str):
+    url = f"https://services.nacse.org/prism/data/get/{region}/{resolution}/{var}/{date_str}"
+    r = requests.get(url, stream=True); r.raise_for_status()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        zpath = os.path.join(tmpdir, f"{var}_{date_str}.zip")
+        with open(zpath,'wb') as f:
+            for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE): f.write(chunk)
+        with zipfile.ZipFile(zpath,'r') as z: z.extractall(tmpdir)
+        tif = next((os.path.join(tmpdir,f) for f in os.listdir(tmpdir) if f.lower().endswith('.tif')), None)
+        if not tif: return None
+        with rasterio.open(tif) as src:
+            arr, out_transform = rasterio.mask.mask(src, [mapping(poly)], crop=True, indexes=1)
+            return arr, out_transform, src.nodata
+
 def fetch_prism_timeseries(polygon_geojson: dict, start_date: str, end_date: str,
                            region: str = "us", resolution: str = "4km",
                            variables: list = None) -> dict:
     if variables is None:
-        variables = ["ppt","tmin","tmax","tmean","tdmean","vpdmin","vpdmax"]
+        variables = PRISM_VARIABLES
     times = []
+    tasks = []
     points_data = {}
     start = datetime.strptime(start_date, "%Y-%m-%d")
     stop  = datetime.strptime(end_date,   "%Y-%m-%d")
@@ -81,28 +100,23 @@ def fetch_prism_timeseries(polygon_geojson: dict, start_date: str, end_date: str
     poly = shape(polygon_geojson)
     current = start
     while current <= stop:
-        date_str = current.strftime("%Y%m%d")
         times.append(current.strftime("%Y-%m-%d"))
-        for var in variables:
-            url = f"https://services.nacse.org/prism/data/get/{region}/{resolution}/{var}/{date_str}"
-            r = requests.get(url, stream=True); r.raise_for_status()
-            with tempfile.TemporaryDirectory() as tmpdir:
-                zpath = os.path.join(tmpdir, f"{var}_{date_str}.zip")
-                with open(zpath,'wb') as f: f.write(r.content)
-                with zipfile.ZipFile(zpath,'r') as z: z.extractall(tmpdir)
-                tif = next((os.path.join(tmpdir,f) for f in os.listdir(tmpdir) if f.lower().endswith('.tif')), None)
-                if not tif: continue
-                with rasterio.open(tif) as src:
-                    out_img, out_transform = rasterio.mask.mask(src, [mapping(poly)], crop=True)
-                    arr = out_img[0]; nodata = src.nodata
-                for i in range(arr.shape[0]):
-                    for j in range(arr.shape[1]):
-                        val = arr[i,j]
-                        if nodata is not None and val==nodata: continue
-                        x,y = rasterio.transform.xy(out_transform,i,j,offset='center')
-                        key=(round(x,6),round(y,6))
-                        points_data.setdefault(key,{v:[] for v in variables})[var].append(float(val))
+        tasks.extend((var, current.strftime("%Y%m%d")) for var in variables)
         current += delta
+    # Downloads dominate; fetch (var, day) rasters concurrently, then fold them in request order
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        clips = list(executor.map(lambda t: _fetch_prism_clip(poly, t[0], t[1], region, resolution), tasks))
+    for (var, _), clip in zip(tasks, clips):
+        if clip is None: continue
+        arr, out_transform, nodata = clip
+        # Valid pixels in row-major order and their centres in one vectorized transform
+        valid = arr != nodata if nodata is not None else np.ones(arr.shape, dtype=bool)
+        rows, cols = np.nonzero(valid)
+        if rows.size == 0: continue
+        xs, ys = rasterio.transform.xy(out_transform, rows, cols, offset='center')
+        for x, y, val in zip(np.asarray(xs).tolist(), np.asarray(ys).tolist(), arr[valid].tolist()):
+            key=(round(x,6),round(y,6))
+            points_data.setdefault(key,{v:[] for v in variables})[var].append(float(val))
     results = []
     for idx,(xy,vars_) in enumerate(points_data.items()):
         results.append({"id": idx, "x": xy[0], "y": xy[1], "series": {"time": times, **vars_}})
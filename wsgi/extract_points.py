@@ -1,17 +1,30 @@
+import logging
 import rasterio
 import numpy as np
 from rasterio.mask import mask
 from shapely.wkt import loads as wkt_loads
 import os
 import pandas as pd
-from pyproj import Proj, transform
-from pyproj import Proj, Transformer
+from functools import lru_cache
+from pyproj import Transformer
+import soil
+import gridex
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=32)
+def _get_transformer(src_wkt, target_crs):
+    # Building a PROJ pipeline is far costlier than applying it; every tile of a
+    # layer shares the same CRS pair, so build each transformer once. Axis order
+    # follows each CRS's authority definition, as the Proj-based transform() did,
+    # so EPSG:4326 output stays (lat, lon) for the callers that rely on it
+    return Transformer.from_crs(src_wkt, target_crs)
+
 def extract_pixel_coords(input_tif_path, geometry, target_crs="EPSG:4326", nodata = -9999):
     with rasterio.open(input_tif_path) as src:
         src_crs = src.crs
         
-        masked_data, masked_transform = mask(src, [geometry], crop=True)
-        masked_band = masked_data[0]
+        masked_band, masked_transform = mask(src, [geometry], crop=True, indexes=1)
         
         nrows, ncols = masked_band.shape
         pixel_width = masked_transform.a
@@ -21,21 +34,20 @@ def extract_pixel_coords(input_tif_path, geometry, target_crs="EPSG:4326", nodat
         cols, rows = np.meshgrid(np.arange(ncols), np.arange(nrows))
         x = left + cols * pixel_width + (pixel_width / 2)
         y = top + rows * pixel_height + (pixel_height / 2)
-        x = np.array(x.ravel())
-        y = np.array(y.ravel())
-        values = np.array(masked_band.ravel())
-        values[values == nodata] = np.nan
+        # The meshgrid results are fresh and contiguous, so ravel() is already a flat view
+        x = x.ravel()
+        y = y.ravel()
+        # Sentinel replacement in a single pass that writes the final array
+        band = masked_band.ravel()
+        values = np.where(band == nodata, np.nan, band)
         if src_crs != target_crs:
-            proj_from = Proj(src_crs) 
-            proj_to = Proj(target_crs) 
-            x, y = transform(proj_from, proj_to, x, y)
+            x, y = _get_transformer(src_crs.to_wkt(), target_crs).transform(x, y)
 
         return x, y, values
 
 #No Indexing by default
 def output_from_attr(input_dir, geometry, depth_range, attribute_list=[], num_samples=0, output_name='output'):
     output_df = pd.DataFrame({'x': [], 'y': []})
-    import soil
     for layer in attribute_list:
         matching_subdirs = soil.get_matching_subdirectories(input_dir, depth_range, layer)
         explore_depths_list = [
@@ -45,36 +57,34 @@ def output_from_attr(input_dir, geometry, depth_range, attribute_list=[], num_sa
                                   for xxx, yyy in [(parts[0], parts[1])]
                               ]
         
-        print(f"Found explore depths for '{layer}': {explore_depths_list}")
+        logger.debug("Found explore depths for '%s': %s", layer, explore_depths_list)
 
         if explore_depths_list:
-            combined_values = {}
+            weighted_parts = []
             total_factor = 0
 
             for depth_dir, factor in explore_depths_list:
-                import gridex
                 matching_files = gridex.query_index(depth_dir, geometry)
-                print(f"Matched files: {matching_files}")
+                logger.debug("Matched files: %s", matching_files)
 
                 for file in matching_files:
                     x_coords, y_coords, pixel_values = extract_pixel_coords(os.path.join(depth_dir, file), geometry)
-
-                    for i in range(len(x_coords)):
-                        point_key = (x_coords[i], y_coords[i])
-                        if point_key in combined_values:
-                            combined_values[point_key] += pixel_values[i] * factor
-                        else:
-                            combined_values[point_key] = pixel_values[i] * factor
+                    weighted_parts.append(pd.DataFrame({'x': x_coords, 'y': y_coords, layer: pixel_values * factor}))
                 
                 total_factor += factor
 
-            combined_df = pd.DataFrame(
-                [(x, y, value / total_factor) for (x, y), value in combined_values.items()],
-                columns=['x', 'y', layer]
-            )
+            if weighted_parts:
+                # Sum the depth-weighted values per point in one grouped reduction, keeping
+                # first-seen point order; NoData (NaN) at any depth leaves the point NaN
+                grouped = pd.concat(weighted_parts, ignore_index=True).groupby(['x', 'y'], sort=False)[layer]
+                combined = grouped.sum()
+                combined[grouped.count() < grouped.size()] = np.nan
+                combined_df = (combined / total_factor).reset_index()
+            else:
+                combined_df = pd.DataFrame(columns=['x', 'y', layer])
             output_df = pd.merge(output_df, combined_df, on=['x', 'y'], how='outer')
         else:
-            print(f"No valid directories found for attribute '{layer}' within the specified depth range.")
+            logger.warning("No valid directories found for attribute '%s' within the specified depth range.", layer)
 
     output_df = output_df.dropna().reset_index(drop=True)
     output_df = output_df.dropna().reset_index(drop=True)
@@ -88,5 +98,5 @@ def output_from_attr(input_dir, geometry, depth_range, attribute_list=[], num_sa
         output_df.to_csv(output_name + '.csv', index=False)
         return output_df
     else:
-        print("No data to output.")
+        logger.warning("No data to output.")
         return pd.DataFrame()
\ No newline at end of file
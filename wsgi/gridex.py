@@ -18,6 +18,11 @@ Functions:
     Reads the index file in a directory and returns a list of .tif files whose bounding boxes intersect
     with a provided query geometry in GeoJSON format.
 
+- load_index(index_path, index_mtime):
+    Parses an index file into parallel arrays of file names and geometries, caching the result
+    per file and modification time so repeated queries against the same directory skip the
+    CSV/WKT parsing.
+
 - mbr_overlap(polygon_mbr, file_mbr):
     Checks if two bounding boxes (MBRs) overlap by comparing their minimum and maximum X/Y coordinates.
 
@@ -35,6 +40,8 @@ Functions:
 import os
 import sys
 import csv
+from functools import lru_cache
+import numpy as np
 from osgeo import gdal, osr, ogr
 import shapely
 
@@ -63,57 +70,60 @@ def create_index(directory):
 
         file_id = 0
 
-        # Iterate through all .tif files in the directory
-        for filename in os.listdir(directory):
-            if filename.endswith(".tif"):
-                file_path = os.path.join(directory, filename)
-
-                # Open the TIFF file and extract its bounding box (MBR)
-                dataset = gdal.Open(file_path)
-                if dataset:
-                    geo_transform = dataset.GetGeoTransform()
-                    width = dataset.RasterXSize
-                    height = dataset.RasterYSize
-
-                    # Calculate the bounding box in the original CRS
-                    min_x = geo_transform[0]
-                    max_x = min_x + width * geo_transform[1]
-                    min_y = geo_transform[3] + height * geo_transform[5]
-                    max_y = geo_transform[3]
-
-                    # Get the file size
-                    file_size = os.path.getsize(file_path)
-
-                    # Extract the SRID (EPSG code) from the dataset's projection
-                    srid = get_epsg_code(dataset)
-
-                    # Transform the bounding box to EPSG:4326 for Geometry4326
-                    source_srs = osr.SpatialReference()
-                    source_srs.ImportFromWkt(dataset.GetProjection())
-
-                    target_srs = osr.SpatialReference()
-                    target_srs.ImportFromEPSG(4326)
-                    target_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
-
-                    transform = osr.CoordinateTransformation(source_srs, target_srs)
-
-                    # Transform corners of the bounding box to EPSG:4326
-                    ll = transform.TransformPoint(min_x, min_y)  # Lower-left
-                    lr = transform.TransformPoint(max_x, min_y)  # Lower-right
-                    ur = transform.TransformPoint(max_x, max_y)  # Upper-right
-                    ul = transform.TransformPoint(min_x, max_y)  # Upper-left
-
-                    # Ensure the WKT geometry is in (longitude, latitude) order
-                    wkt_polygon = (
-                        f"POLYGON (({ll[0]} {ll[1]}, {lr[0]} {lr[1]}, "
-                        f"{ur[0]} {ur[1]}, {ul[0]} {ul[1]}, {ll[0]} {ll[1]}))"
-                    )
-
-                    # Write the file information and its bounding box to the index file
-                    writer.writerow([file_id, filename, file_size, min_x, min_y, max_x, max_y, srid, wkt_polygon])
-
-                    # Increment the file ID
-                    file_id += 1
+        # Iterate through all .tif files in the directory; scandir entries carry
+        # the path and a cached stat so each file costs a single syscall
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".tif"):
+                    filename = entry.name
+                    file_path = entry.path
+
+                    # Open the TIFF file and extract its bounding box (MBR)
+                    dataset = gdal.Open(file_path)
+                    if dataset:
+                        geo_transform = dataset.GetGeoTransform()
+                        width = dataset.RasterXSize
+                        height = dataset.RasterYSize
+
+                        # Calculate the bounding box in the original CRS
+                        min_x = geo_transform[0]
+                        max_x = min_x + width * geo_transform[1]
+                        min_y = geo_transform[3] + height * geo_transform[5]
+                        max_y = geo_transform[3]
+
+                        # Get the file size
+                        file_size = entry.stat().st_size
+
+                        # Extract the SRID (EPSG code) from the dataset's projection
+                        srid = get_epsg_code(dataset)
+
+                        # Transform the bounding box to EPSG:4326 for Geometry4326
+                        source_srs = osr.SpatialReference()
+                        source_srs.ImportFromWkt(dataset.GetProjection())
+
+                        target_srs = osr.SpatialReference()
+                        target_srs.ImportFromEPSG(4326)
+                        target_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+
+                        transform = osr.CoordinateTransformation(source_srs, target_srs)
+
+                        # Transform corners of the bounding box to EPSG:4326
+                        ll = transform.TransformPoint(min_x, min_y)  # Lower-left
+                        lr = transform.TransformPoint(max_x, min_y)  # Lower-right
+                        ur = transform.TransformPoint(max_x, max_y)  # Upper-right
+                        ul = transform.TransformPoint(min_x, max_y)  # Upper-left
+
+                        # Ensure the WKT geometry is in (longitude, latitude) order
+                        wkt_polygon = (
+                            f"POLYGON (({ll[0]} {ll[1]}, {lr[0]} {lr[1]}, "
+                            f"{ur[0]} {ur[1]}, {ul[0]} {ul[1]}, {ll[0]} {ll[1]}))"
+                        )
+
+                        # Write the file information and its bounding box to the index file
+                        writer.writerow([file_id, filename, file_size, min_x, min_y, max_x, max_y, srid, wkt_polygon])
+
+                        # Increment the file ID
+                        file_id += 1
 
                     # Close the dataset
                     dataset = None
@@ -153,30 +163,42 @@ def query_index(directory, query_geom):
     index_path = os.path.join(directory, INDEX_FILE)
     overlapping_files = []
 
-    if not os.path.exists(index_path):
+    try:
+        index_mtime = os.stat(index_path).st_mtime_ns
+    except FileNotFoundError:
         # If the index file does not exist, return all .tif files in the directory
         for filename in os.listdir(directory):
             if filename.endswith(".tif"):
                 overlapping_files.append(filename)
         return overlapping_files
 
-    # Open the index file and read the geometries
+    # Check if the query geometry intersects with each file's geometry in one vectorized call
+    file_names, file_geoms = load_index(index_path, index_mtime)
+    return file_names[shapely.intersects(query_geom, file_geoms)].tolist()
+
+@lru_cache(maxsize=1024)
+def load_index(index_path, index_mtime):
+    """
+    Parses an index file into parallel arrays of file names and geometries. Results are cached
+    per index file and modification time, so a server process parses each index once and
+    picks up rewritten indexes automatically. The returned arrays are shared between
+    callers and must not be modified.
+
+    :param index_path: The path to the _index.csv file.
+    :param index_mtime: The modification time of the index file, used as part of the cache key.
+    :return: A tuple (file names, Shapely geometries in EPSG:4326) of equal-length NumPy arrays.
+    """
+    file_names = []
+    wkts = []
     with open(index_path, mode='r') as index_file:
         reader = csv.DictReader(index_file, delimiter=';')
 
         for row in reader:
-            # Get the WKT geometry for the file from the index
-            file_geometry_wkt = row["Geometry4326"]
-
-            # Convert the WKT geometry into an OGR geometry object
-            from shapely.wkt import loads as wkt_loads
-            file_geom = wkt_loads(file_geometry_wkt)
-
-            # Check if the query geometry intersects with the file's geometry
-            if query_geom.intersects(file_geom):
-                overlapping_files.append(row["FileName"])
+            file_names.append(row["FileName"])
+            wkts.append(row["Geometry4326"])
 
-    return overlapping_files
+    # Convert all WKT geometries into Shapely geometry objects in one vectorized call
+    return np.array(file_names, dtype=object), shapely.from_wkt(wkts)
 
 def mbr_overlap(polygon_mbr, file_mbr):
     """
@@ -206,15 +228,12 @@ def index_directories_recursively(root_directory):
         if tif_files:
             index_path = os.path.join(dirpath, INDEX_FILE)
 
-            # If the index file exists, compare timestamps
-            if os.path.exists(index_path):
+            # If the index file exists, compare timestamps (os.walk already listed it)
+            if INDEX_FILE in filenames:
                 index_mod_time = os.path.getmtime(index_path)
-                tif_files_mod_times = [
-                    os.path.getmtime(os.path.join(dirpath, f)) for f in tif_files
-                ]
 
-                # Skip if the index file is newer than all .tif files
-                if all(index_mod_time >= tif_mod_time for tif_mod_time in tif_files_mod_times):
+                # Skip if the index file is newer than all .tif files; stop stat-ing at the first newer one
+                if all(index_mod_time >= os.path.getmtime(os.path.join(dirpath, f)) for f in tif_files):
                     print(f"Index file in {dirpath} is up-to-date. Skipping.")
                     continue
 
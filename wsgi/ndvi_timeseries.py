@@ -124,16 +124,17 @@ def get_mean_ndvi(tiff_file, query_polygon):
     raster_band = out_raster.GetRasterBand(1)
     clipped_data = raster_band.ReadAsArray()
 
-    # Mask NoData values (0 means NoData)
-    clipped_data = clipped_data[clipped_data != 0]
+    # Mask NoData values (0 means NoData); zeros add nothing to the sum, so the mean
+    # of valid pixels needs no filtered copy
+    valid_count = np.count_nonzero(clipped_data)
 
-    if clipped_data.size == 0:
+    if valid_count == 0:
         return None
 
-    # Scale values from [1, 255] to [-1, +1]
-    scaled_data = (clipped_data - 1) * (2 / 254) - 1
+    mean_value = clipped_data.sum(dtype=np.float64) / valid_count
 
-    return np.mean(scaled_data)
+    # Scale values from [1, 255] to [-1, +1]; the mapping is linear, so scale the mean
+    return (mean_value - 1) * (2 / 254) - 1
 
 @ndvi_timeseries_bp.route('/ndvi/singlepolygon.json', methods=['POST', 'GET'])
 def ndvi_timeseries():
@@ -156,12 +157,14 @@ def ndvi_timeseries():
     if not from_date or not to_date:
         return jsonify({"error": "Missing required date range parameters"}), 400
 
-    # Filter directories matching the date range
-    filtered_subdirs = [
-        os.path.join(NDVI_DATA_DIR, subdir)
-        for subdir in os.listdir(NDVI_DATA_DIR)
-        if from_date <= subdir <= to_date
-    ]
+    # Filter directories matching the date range; scandir yields the full path and
+    # the entry type from the directory listing itself, without extra stat calls
+    with os.scandir(NDVI_DATA_DIR) as entries:
+        filtered_subdirs = [
+            entry.path
+            for entry in entries
+            if from_date <= entry.name <= to_date and entry.is_dir()
+        ]
 
     if not filtered_subdirs:
         return jsonify({"error": "No data found for the given date range"}), 404
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from shapely.geometry import shape
+import pandas as pd
+import xarray as xr
 import pynldas2 as nldas
 
 nldas_bp = Blueprint("nldas", __name__)
@@ -26,14 +28,18 @@ def nldas_index():
     except Exception as e:
         return jsonify({"error": "Failed to fetch NLDAS data", "details": str(e)}), 500
 
-    # Sample at each vertex (x=lon, y=lat)
+    # Sample at each vertex (x=lon, y=lat) with one vectorized nearest-neighbour
+    # selection over all vertices instead of one sel/to_dataframe per vertex
     coords = body["coordinates"][0]
+    lons = xr.DataArray([lon for lon, _ in coords], dims="point")
+    lats = xr.DataArray([lat for _, lat in coords], dims="point")
+    points_ds = ds.sel(x=lons, y=lats, method="nearest").transpose("point", "time")
+    values = {var: points_ds[var].values for var in ds.data_vars}
+    times = pd.Series(points_ds.indexes["time"]).astype(str).tolist()
     results = []
     for idx, (lon, lat) in enumerate(coords):
-        point_ds = ds.sel(x=lon, y=lat, method="nearest")
-        df = point_ds.to_dataframe().reset_index()
-        series = {var: df[var].tolist() for var in ds.data_vars}
-        series["time"] = df["time"].astype(str).tolist()
+        series = {var: values[var][idx].tolist() for var in ds.data_vars}
+        series["time"] = times
         results.append({
             "id":     idx,
             "x":      lon,
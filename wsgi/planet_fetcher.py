@@ -1,17 +1,29 @@
 # wsgi/planet_fetcher.py
 import os, requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from flask import Blueprint, request, jsonify
 from shapely.geometry import shape, Point
 
 planet_bp = Blueprint("planet", __name__)
 
-def _search_planet_by_geom(geom, date_from, date_to):
+# Concurrent quick-search requests per polygon; kept small to stay polite to the API
+PLANET_WORKERS = 4
+
+def _planet_session():
     API_KEY = os.getenv("PL_API_KEY")
     if not API_KEY:
         raise RuntimeError("PL_API_KEY not set")
 
-    auth = HTTPBasicAuth(API_KEY, "")
+    # One authenticated session per request so the per-vertex searches reuse
+    # pooled keep-alive connections instead of a new TLS handshake each
+    session = requests.Session()
+    session.auth = HTTPBasicAuth(API_KEY, "")
+    session.mount("https://", HTTPAdapter(pool_maxsize=PLANET_WORKERS))
+    return session
+
+def _search_planet_by_geom(session, geom, date_from, date_to):
     url = "https://api.planet.com/data/v1/quick-search"
 
     payload = {
@@ -29,7 +41,7 @@ def _search_planet_by_geom(geom, date_from, date_to):
         }
     }
 
-    r = requests.post(url, auth=auth, json=payload)
+    r = session.post(url, json=payload)
     r.raise_for_status()
     features = r.json().get("features", [])
     return [
@@ -66,11 +78,17 @@ def planet_index():
     # get each vertex
     points = list(poly.exterior.coords)
 
-    # for each point, run a point‐based search
-    out = []
-    for idx, (lon, lat) in enumerate(points):
+    # for each point, run a point‐based search; the searches are independent
+    # round trips, so issue them concurrently and collect them in vertex order
+    def search_point(lon, lat):
         pt = {"type": "Point", "coordinates": [lon, lat]}
-        scenes = _search_planet_by_geom(pt, date_from, date_to)
+        return _search_planet_by_geom(session, pt, date_from, date_to)
+
+    with _planet_session() as session, ThreadPoolExecutor(max_workers=PLANET_WORKERS) as executor:
+        all_scenes = list(executor.map(lambda p: search_point(*p), points))
+
+    out = []
+    for idx, ((lon, lat), scenes) in enumerate(zip(points, all_scenes)):
         out.append({
             "id":      idx,
             "x":       lon,
@@ -14,9 +14,13 @@ Functions:
 """
 
 import os  # For working with paths and directories
+import re  # For parsing depth ranges out of directory names
 import sys  # For handling system-level operations (like file path errors)
 from typing import List  # For type hints (if necessary)
 
+# Matches depth subdirectories such as "0_5_compressed", capturing the from/to depths
+DEPTH_DIR_PATTERN = re.compile(r"^(\d+)_(\d+)_compressed$")
+
 def get_matching_subdirectories(polaris_path, depth_range, layer):
     """
     Get subdirectories that match the depth range query for a specific layer.
@@ -42,18 +46,16 @@ def get_matching_subdirectories(polaris_path, depth_range, layer):
         raise FileNotFoundError(f"Layer directory does not exist: {layer_dir}")
 
     # Iterate over the subdirectories in the layer directory
-    for subdir in os.listdir(layer_dir):
-        if subdir.endswith("_compressed"):
+    with os.scandir(layer_dir) as entries:
+        for entry in entries:
             # Extract the depth range from the subdirectory name, e.g., "0_5_compressed" -> 0 and 5
-            depth_str = subdir.replace("_compressed", "")
-            try:
-                sub_from_depth, sub_to_depth = map(int, depth_str.split('_'))
-            except ValueError:
-                continue  # Skip subdirectories that do not match the expected format
-
-            # Check if the subdirectory depth range overlaps with the input range
-            if (sub_from_depth <= to_depth) and (sub_to_depth >= from_depth):
-                # If there is overlap, add the full subdirectory path to the matching list
-                matching_dirs.append(os.path.join(layer_dir, subdir))
+            match = DEPTH_DIR_PATTERN.match(entry.name)
+            if match:
+                sub_from_depth, sub_to_depth = map(int, match.groups())
+
+                # Check if the subdirectory depth range overlaps with the input range
+                if (sub_from_depth <= to_depth) and (sub_to_depth >= from_depth):
+                    # If there is overlap, add the full subdirectory path to the matching list
+                    matching_dirs.append(entry.path)
 
     return matching_dirs
@@ -51,26 +51,22 @@ import os
 import sys
 import tempfile
 from io import StringIO
+import logging
 from flask import Blueprint, request, jsonify
-from shapely.geometry import shape
+from shapely.geometry import shape, mapping
 from extract_points import *
 from choose_points import *
 from conf import SOIL_DATA_DIR, SOIL_LAYERS
 
 soil_sample_bp = Blueprint("soil_sample", __name__)
+logger = logging.getLogger(__name__)
 
 def calculate_statistics(sample, original_df):
     statistics = {}
     layers = original_df.columns[2:]
-    sample_df = pd.DataFrame()
-    for i, row in sample.iterrows():
-        x_value = row['x']
-        y_value = row['y']
-        matching_rows = original_df[(original_df['x'] == x_value) & (original_df['y'] == y_value)]
-        if not sample_df.empty:
-            sample_df = pd.concat([sample_df, matching_rows], ignore_index=True)
-        else:
-            sample_df = matching_rows
+    # Look up every sampled point's layer values in one join; an inner merge keeps
+    # the sample order and yields one row per matching original row
+    sample_df = sample[['x', 'y']].merge(original_df, on=['x', 'y'], how='inner')
     if sample_df.empty:
         return "No matching data found for the sample"
     elif len(sample_df) != len(sample):
@@ -137,9 +133,8 @@ def process_request(query_params, query_geometry):
     # Calculate statistics for the layers
     statistics = calculate_statistics(sample_df, df)
 
-    import shapely.geometry
     response_data = {
-        "query": shapely.geometry.mapping(query_geometry),
+        "query": mapping(query_geometry),
         "results": [{"x": row['x'], "y": row['y'], "id": index} for index, row in sample_df.iterrows()],
         "statistics": {
             "layers": statistics
@@ -155,7 +150,7 @@ def soil_sample():
     query_params = request.args  # Automatically handles QUERY_STRING
     try:
         # Read and parse GeoJSON geometry from the payload
-        print("Request data:", str(request.data), file=sys.stderr)
+        logger.debug("Request data: %s", request.data)
         query_geometry = shape(request.get_json())
 
         # Simulate process_request function (implement your logic here)
@@ -37,7 +37,7 @@ from functools import partial
 import soil  # Import the soil module
 from conf import SOIL_DATA_DIR, SOIL_LAYERS
 import gridex
-import shapely
+from shapely.geometry import shape, mapping
 
 soil_stats_bp = Blueprint("soil_stats", __name__)
 
@@ -95,11 +95,12 @@ def get_pixel_values_within_polygon(tiff_file, query_polygon):
     # Extract NoData value for the band, if any
     no_data_value = raster_band.GetNoDataValue()
 
-    # Flatten the array and filter out NoData values
+    # Flatten the array and filter out NoData values; boolean indexing already returns
+    # a new 1-D array, and ravel() avoids copying the freshly read band
     if no_data_value is not None:
-        pixel_values = clipped_data[clipped_data != no_data_value].flatten()
+        pixel_values = clipped_data[clipped_data != no_data_value]
     else:
-        pixel_values = clipped_data.flatten()
+        pixel_values = clipped_data.ravel()
 
     return pixel_values
 
@@ -108,16 +109,20 @@ def calculate_statistics(values):
     if len(values) == 0:
         return {}
 
+    # One partition for all three quantiles, and the mean from the single sum
+    lowerquart, median, upperquart = np.percentile(values, [25, 50, 75])
+    total = np.sum(values)
+    count = len(values)
     return {
         "min": float(np.min(values)),
         "max": float(np.max(values)),
-        "mean": float(np.mean(values)),
+        "mean": float(total / count),
         "stddev": float(np.std(values)),
-        "median": float(np.median(values)),
-        "lowerquart": float(np.percentile(values, 25)),
-        "upperquart": float(np.percentile(values, 75)),
-        "sum": float(np.sum(values)),
-        "count": int(len(values))
+        "median": float(median),
+        "lowerquart": float(lowerquart),
+        "upperquart": float(upperquart),
+        "sum": float(total),
+        "count": int(count)
     }
 
 # Function to process TIFF files
@@ -133,9 +138,10 @@ def process_tiff_file(tiff_file_info, query_polygon):
     tiff_file_path, depth_weight = tiff_file_info
     pixel_values = get_pixel_values_within_polygon(tiff_file_path, query_polygon)
 
-    # Apply the depth weight if there are any valid pixel values
+    # Apply the depth weight in place if there are any valid pixel values
     if pixel_values.size > 0:
-        return pixel_values * depth_weight, depth_weight
+        pixel_values *= depth_weight
+        return pixel_values, depth_weight
     return np.array([]), 0
 
 # Endpoint for soil_stats
@@ -146,7 +152,6 @@ def soil_stats():
         query_polygon = request.get_json()
         if not query_polygon:
             return jsonify({"error": "Invalid GeoJSON polygon"}), 400
-        from shapely.geometry import shape
         query_polygon = shape(query_polygon)
 
         # Parse query parameters
@@ -165,8 +170,8 @@ def soil_stats():
         # Collect all TIFF files and their associated depth weight
         tiff_file_infos = []
         for subdir in matching_subdirs:
-            depth_str = os.path.basename(subdir).replace("_compressed", "")
-            sub_from_depth, sub_to_depth = map(int, depth_str.split('_'))
+            match = soil.DEPTH_DIR_PATTERN.match(os.path.basename(subdir))
+            sub_from_depth, sub_to_depth = map(int, match.groups())
             depth_weight = sub_to_depth - sub_from_depth
 
             # Find TIFF files that overlap with the query polygon
@@ -194,21 +199,23 @@ def soil_stats():
             for future in concurrent.futures.as_completed(future_to_tiff):
                 pixel_values, depth_weight = future.result()
                 if pixel_values.size > 0:
-                    all_pixel_values.extend(pixel_values)
+                    all_pixel_values.append(pixel_values)
                     total_weight += depth_weight
 
         if not all_pixel_values:
             return jsonify({"error": "No valid data found in the queried area"}), 404
 
         # Calculate weighted statistics
-        all_pixel_values = np.array(all_pixel_values)
-        weighted_stats = calculate_statistics(all_pixel_values / total_weight)
+        # Join the per-file arrays in one copy instead of going through Python floats;
+        # integer layers are promoted to float before normalising in place
+        all_pixel_values = np.concatenate(all_pixel_values).astype(np.float64, copy=False)
+        all_pixel_values /= total_weight
+        weighted_stats = calculate_statistics(all_pixel_values)
 
         # Return JSON response
-        import shapely
         response = {
             "query": {
-                "geometry": shapely.geometry.mapping(query_polygon),
+                "geometry": mapping(query_polygon),
                 "depth_range": depth_range,
                 "layer": layer
             },